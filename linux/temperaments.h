@@ -25,7 +25,7 @@
 #ifndef Temperaments_h
 #define Temperaments_h
 
-double temperaments[32][12] =
+static const double temperaments[32][12] =
   {
     // Kirnberger II
     {1.000000000, 1.053497163, 1.125000000, 1.185185185,
@@ -399,19 +399,22 @@ void *readAudio(void *)
     static double xp[RANGE];
     static double xf[RANGE];
 
-    static double x2[RANGE / 2];
-    static double x3[RANGE / 3];
-    static double x4[RANGE / 4];
-    static double x5[RANGE / 5];
-
     static double dx[RANGE];
 
+    static double window[SAMPLES];
+
+    static double references[NOTES];
+
     static maximum maxima[MAXIMA];
     static double  values[MAXIMA];
 
     static const double fps = (double)SAMPLE_RATE / (double)SAMPLES;
     static const double expect = 2.0 * M_PI * (double)STEP / (double)SAMPLES;
 
+    // Reciprocals for the phase calculations
+    static const double rpi = 1.0 / M_PI;
+    static const double rdf = OVERSAMPLE / (2.0 * M_PI);
+
     static short data[STEP];
 
     // Initialise data structs
@@ -427,6 +430,10 @@ void *readAudio(void *)
 	display.maxima = maxima;
     }
 
+    // Calculate the window once, rather than for every buffer
+    for (int i = 0; i < SAMPLES; i++)
+	window[i] = 0.5 - 0.5 * cos(2.0 * M_PI * i / SAMPLES);
+
     while (!audio.done)
     {
       // Get the data
@@ -466,8 +473,8 @@ void *readAudio(void *)
 	if (dmax < 4096.0)
 	    dmax = 4096.0;
 
-	// Calculate normalising value
-	double norm = dmax;
+	// Calculate normalising value, as a multiplier
+	double norm = 1.0 / dmax;
 	dmax = 0.0;
 
 	// Copy data to FFT input arrays for tuner
@@ -477,13 +484,8 @@ void *readAudio(void *)
 	    if (dmax < fabs(buffer[i]))
 		dmax = fabs(buffer[i]);
 
-	    // Calculate the window
-	    double window =
-		0.5 - 0.5 * cos(2.0 * M_PI *
-				i / SAMPLES);
-
 	    // Normalise and window the input data
-	    x[i].r = (double)buffer[i] / norm * window;
+	    x[i].r = buffer[i] * norm * window[i];
 	}
 
 	// do FFT for tuner
@@ -505,7 +507,7 @@ void *readAudio(void *)
 	    // Calculate phase difference
 	    dp -= (double)i * expect;
 
-	    int qpd = dp / M_PI;
+	    int qpd = dp * rpi;
 
 	    if (qpd >= 0)
 		qpd += qpd & 1;
@@ -516,7 +518,7 @@ void *readAudio(void *)
 	    dp -=  M_PI * (double)qpd;
 
 	    // Calculate frequency difference
-	    double df = OVERSAMPLE * dp / (2.0 * M_PI);
+	    double df = dp * rdf;
 
 	    // Calculate actual frequency from slot frequency plus
 	    // frequency difference and correction value
@@ -526,56 +528,78 @@ void *readAudio(void *)
 	    dx[i] = xa[i] - xa[i - 1];
 	}
 
-	// Downsample
+	// Downsample, in place. The downsamples for slot i only use
+	// slots above i, which haven't been changed yet
 	if (audio.downsample)
 	{
-	    // x2 = xa << 2
-	    for (uint i = 0; i < Length(x2); i++)
+	    for (uint i = 1; i < Length(xa); i++)
 	    {
-		x2[i] = 0.0;
+		// Sum of xa[i * k] to xa[i * k + k - 1]
+		for (uint k = 2; k <= 5; k++)
+		{
+		    double xk = 0.0;
 
-		for (int j = 0; j < 2; j++)
-		    x2[i] += xa[(i * 2) + j];
-	    }
+		    if (i < RANGE / k)
+			for (uint j = 0; j < k; j++)
+			    xk += xa[(i * k) + j];
 
-	    // x3 = xa << 3
-	    for (uint i = 0; i < Length(x3); i++)
-	    {
-		x3[i] = 0.0;
+		    xa[i] *= xk;
+		}
 
-		for (int j = 0; j < 3; j++)
-		    x3[i] += xa[(i * 3) + j];
+		// Recalculate differences
+		dx[i] = xa[i] - xa[i - 1];
 	    }
+	}
 
-	    // x4 = xa << 4
-	    for (uint i = 0; i < Length(x4); i++)
-	    {
-		x4[i] = 0.0;
+	// Options used for the reference note frequencies
+	static double reference;
+	static gint temperament;
+	static gint key;
 
-		for (int j = 0; j < 4; j++)
-		    x4[i] += xa[(i * 4) + j];
-	    }
+	// Frequency range of the reference note frequencies
+	static double lower;
+	static double upper;
 
-	    // x5 = xa << 5
-	    for (uint i = 0; i < Length(x5); i++)
-	    {
-		x5[i] = 0.0;
+	// Recalculate reference note frequencies if options changed
+	if (reference != audio.reference ||
+	    temperament != audio.temperament ||
+	    key != audio.key)
+	{
+	    reference = audio.reference;
+	    temperament = audio.temperament;
+	    key = audio.key;
 
-		for (int j = 0; j < 5; j++)
-		    x5[i] += xa[(i * 5) + j];
-	    }
+	    // Frequencies that round to the first and last notes
+	    lower = reference * pow(2.0, (-C5_OFFSET - 0.5) / 12.0);
+	    upper = reference * pow(2.0, (NOTES - C5_OFFSET - 0.5) / 12.0);
 
-	    // Add downsamples
-	    for (uint i = 1; i < Length(xa); i++)
+	    // A note number
+	    int a = (A_OFFSET - key + OCTAVE) % OCTAVE;
+
+	    // Temperament adjustment for each note in the octave
+	    double temperAdjust[OCTAVE];
+
+	    for (int i = 0; i < OCTAVE; i++)
 	    {
-                xa[i] *= (i < Length(x2))? x2[i]: 0.0;
-                xa[i] *= (i < Length(x3))? x3[i]: 0.0;
-                xa[i] *= (i < Length(x4))? x4[i]: 0.0;
-                xa[i] *= (i < Length(x5))? x5[i]: 0.0;
+		// Octave note number
+		int n = (i - key + OCTAVE) % OCTAVE;
 
-		// Recalculate differences
-		dx[i] = xa[i] - xa[i - 1];
+		// Temperament ratio
+		double temperRatio = temperaments[temperament][n] /
+		    temperaments[temperament][a];
+		// Equal ratio
+		double equalRatio = temperaments[EQUAL][n] /
+		    temperaments[EQUAL][a];
+
+		temperAdjust[i] = temperRatio / equalRatio;
 	    }
+
+	    // Reference notes for the lowest octave, each octave above
+	    // is double the one below
+	    for (int i = 0; i < NOTES; i++)
+		references[i] = (i < OCTAVE)?
+		    reference * pow(2.0, (i - C5_OFFSET) / 12.0) *
+		    temperAdjust[i]: references[i - OCTAVE] * 2.0;
 	}
 
 	// Maximum FFT output
@@ -588,22 +612,31 @@ void *readAudio(void *)
 	// Find maximum value, and list of maxima
 	for (int i = 1; i < limit; i++)
 	{
-            // Clear maxima
-            maxima[count].f  = 0.0;
-            maxima[count].fr = 0.0;
-            maxima[count].n  = 0;
+            // Skip slots outside the note range without calculating
+            // the note number
+            if (xf[i] <= lower || xf[i] >= upper)
+                continue;
+
+	    // Check for a maximum
+	    gboolean peak = !display.lock && count < Length(maxima) &&
+		xa[i] > MINIMUM && xa[i] > (max / 4.0) &&
+		dx[i] > 0.0 && dx[i + 1] < 0.0;
 
-            values[count] = 0.0;
+            // Note number, only needed for the filters and maxima
+            int note = 0;
 
-            // Cents relative to reference
-            double cf = -12.0 * log2(audio.reference / xf[i]);
+            if (peak || audio.note || (audio.fundamental && count > 0))
+            {
+                // Cents relative to reference
+                double cf = -12.0 * log2(reference / xf[i]);
 
-            // Note number
-            int note = round(cf) + C5_OFFSET;
+                note = round(cf) + C5_OFFSET;
 
-            // Don't use if negative
-            if (note < 0)
-                continue;
+                // Don't use if out of range, the range check above
+                // may be out by rounding at the limits
+                if (note < 0 || note >= NOTES)
+                    continue;
+            }
 
             // Fundamental filter
             if (audio.fundamental && (count > 0) &&
@@ -633,10 +666,8 @@ void *readAudio(void *)
 		f = xf[i];
 	    }
 
-	    // If display not locked, find maxima and add to list
-	    if (!display.lock && count < Length(maxima) &&
-		xa[i] > MINIMUM && xa[i] > (max / 4.0) &&
-		dx[i] > 0.0 && dx[i + 1] < 0.0)
+	    // If display not locked, add maximum to list
+	    if (peak)
 	    {
                 // Frequency
 		maxima[count].f = xf[i];
@@ -644,24 +675,8 @@ void *readAudio(void *)
 		// Note number
 		maxima[count].n = note;
 
-                // Octave note number
-                int n = (note - audio.key + OCTAVE) % OCTAVE;
-                // A note number
-                int a = (A_OFFSET - audio.key + OCTAVE) % OCTAVE;
-
-                // Temperament ratio
-                double temperRatio = temperaments[audio.temperament][n] /
-                    temperaments[audio.temperament][a];
-                // Equal ratio
-                double equalRatio = temperaments[EQUAL][n] /
-                    temperaments[EQUAL][a];
-
-                // Temperament adjustment
-                double temperAdjust = temperRatio / equalRatio;
-
 		// Reference note
-		maxima[count].fr = audio.reference *
-                    pow(2.0, round(cf) / 12.0) * temperAdjust;
+		maxima[count].fr = references[note];
 
 		// Set limit to octave above
 		if (!audio.downsample && (limit > i * 2))
@@ -671,6 +686,16 @@ void *readAudio(void *)
 	    }
 	}
 
+	// Clear the next maximum
+	if (count < Length(maxima))
+	{
+	    maxima[count].f  = 0.0;
+	    maxima[count].fr = 0.0;
+	    maxima[count].n  = 0;
+
+	    values[count] = 0.0;
+	}
+
 	// Reference note frequency and lower and upper limits
 	double fr = 0.0;
 	double fl = 0.0;
@@ -694,7 +719,7 @@ void *readAudio(void *)
 
 	    // Cents relative to reference
 	    double cf =
-		-12.0 * log2(audio.reference / f);
+		-12.0 * log2(reference / f);
 
             // Don't count silly values
             if (isnan(cf))
@@ -706,32 +731,16 @@ void *readAudio(void *)
             // Note number
             note = round(cf) + C5_OFFSET;
 
-            if (note < 0)
+            if (note < 0 || note >= NOTES)
                 found = false;
 
-            // Octave note number
-            int n = (note - audio.key + OCTAVE) % OCTAVE;
-            // A note number
-            int a = (A_OFFSET - audio.key + OCTAVE) % OCTAVE;
-
-            // Temperament ratio
-            double temperRatio = temperaments[audio.temperament][n] /
-                temperaments[audio.temperament][a];
-            // Equal ratio
-            double equalRatio = temperaments[EQUAL][n] /
-                temperaments[EQUAL][a];
-
-            // Temperament adjustment
-            double temperAdjust = temperRatio / equalRatio;
-
 	    // Reference note
-	    fr = audio.reference * pow(2.0, round(cf) / 12.0) * temperAdjust;
+	    else
+		fr = references[note];
 
 	    // Lower and upper freq
-	    fl = audio.reference * pow(2.0, (round(cf) - 0.55) /
-                                       12.0) * temperAdjust;
-	    fh = audio.reference * pow(2.0, (round(cf) + 0.55) /
-                                       12.0) * temperAdjust;
+	    fl = fr * pow(2.0, -0.55 / 12.0);
+	    fh = fr * pow(2.0, 0.55 / 12.0);
 
 	    // Find nearest maximum to reference note
 	    double df = 1000.0;
@@ -874,6 +883,28 @@ void *readAudio(void *)
 // Real to complex FFT, ignores imaginary values in input array
 void fftr(complex a[], int n)
 {
+    // Twiddle factors for the last stage, earlier stages use every
+    // second, fourth, and so on
+    static complex w[SAMPLES / 2];
+    static int length;
+
+    // Table only fits n up to SAMPLES
+    if (n > SAMPLES)
+	return;
+
+    // Calculate them once
+    if (length != n)
+    {
+	double delta = (M_PI / (n / 2));
+	for (int i = 0; i < n / 2; i++)
+	{
+	    w[i].r = cos(i * delta);
+	    w[i].i = sin(i * delta);
+	}
+
+	length = n;
+    }
+
     double norm = sqrt(1.0 / n);
 
     for (int i = 0, j = 0; i < n; i++)
@@ -901,12 +932,11 @@ void fftr(complex a[], int n)
     for (int mmax = 1, istep = 2 * mmax; mmax < n;
 	 mmax = istep, istep = 2 * mmax)
     {
-	double delta = (M_PI / mmax);
+	int step = n / istep;
 	for (int m = 0; m < mmax; m++)
 	{
-	    double w = m * delta;
-	    double wr = cos(w);
-	    double wi = sin(w);
+	    double wr = w[m * step].r;
+	    double wi = w[m * step].i;
 
 	    for (int i = m; i < n; i += istep)
 	    {
@@ -2039,11 +2069,24 @@ gboolean meter_draw_callback(GtkWidget *widget, cairo_t *cr, gpointer)
     cairo_set_antialias(cr, CAIRO_ANTIALIAS_NONE);
     cairo_stroke(cr);
 
-    cairo_pattern_t *linear =
-        cairo_pattern_create_linear(0, height * 3 / 4 - height / 16,
-                                    0, height * 3 / 4 + height / 16);
-    cairo_pattern_add_color_stop_rgb(linear, 0, 0.5, 0.5, 0.5);
-    cairo_pattern_add_color_stop_rgb(linear, 4, 1, 1, 1);
+    // Scale pattern depends on the height, so only create it when
+    // the height changes
+    static cairo_pattern_t *linear;
+    static int size;
+
+    if (linear == NULL || size != height)
+    {
+        if (linear != NULL)
+            cairo_pattern_destroy(linear);
+
+        linear =
+            cairo_pattern_create_linear(0, height * 3 / 4 - height / 16,
+                                        0, height * 3 / 4 + height / 16);
+        cairo_pattern_add_color_stop_rgb(linear, 0, 0.5, 0.5, 0.5);
+        cairo_pattern_add_color_stop_rgb(linear, 4, 1, 1, 1);
+
+        size = height;
+    }
 
     cairo_set_source(cr, linear);
     cairo_rectangle(cr, -(width - width / 16) / 2, height * 3 / 4 - height / 32,
@@ -2052,7 +2095,6 @@ gboolean meter_draw_callback(GtkWidget *widget, cairo_t *cr, gpointer)
     cairo_set_antialias(cr, CAIRO_ANTIALIAS_DEFAULT);
     cairo_set_line_cap(cr, CAIRO_LINE_CAP_ROUND);
     cairo_stroke(cr);
-    cairo_pattern_destroy(linear);
 
     static double mc;
 
@@ -2065,12 +2107,18 @@ gboolean meter_draw_callback(GtkWidget *widget, cairo_t *cr, gpointer)
 
     cairo_scale(cr, height / 56.0, height / 56.0);
 
-    linear = cairo_pattern_create_linear(0, 0, 0, 12);
-    cairo_pattern_add_color_stop_rgb(linear, 0, 1, 1, 1);
-    cairo_pattern_add_color_stop_rgb(linear, 12, 0, 0, 0);
-    cairo_pattern_set_extend(linear, CAIRO_EXTEND_REFLECT);
+    // Thumb pattern is in thumb coordinates, so only create it once
+    static cairo_pattern_t *thumb;
 
-    cairo_set_source(cr, linear);
+    if (thumb == NULL)
+    {
+        thumb = cairo_pattern_create_linear(0, 0, 0, 12);
+        cairo_pattern_add_color_stop_rgb(thumb, 0, 1, 1, 1);
+        cairo_pattern_add_color_stop_rgb(thumb, 12, 0, 0, 0);
+        cairo_pattern_set_extend(thumb, CAIRO_EXTEND_REFLECT);
+    }
+
+    cairo_set_source(cr, thumb);
 
     cairo_move_to(cr, 0, -12);
     cairo_rel_line_to(cr, -5, 5);
@@ -2085,7 +2133,6 @@ gboolean meter_draw_callback(GtkWidget *widget, cairo_t *cr, gpointer)
     cairo_set_line_width(cr, 1);
 
     cairo_stroke(cr);
-    cairo_pattern_destroy(linear);
 
     return true;
 }
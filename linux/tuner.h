@@ -78,7 +78,8 @@ enum
      C5_OFFSET    = 57,
      A_OFFSET     = 9,
      OCTAVE       = 12,
-     EQUAL        = 8};
+     EQUAL        = 8,
+     NOTES        = OCTAVE * 11};
 
 // Strobe colours
 enum